@@ -0,0 +1,106 @@
+"""
+Export the trained risk model to ONNX and produce an int8-quantized variant.
+
+The quantized model (model.int8.onnx) halves weight storage and enables
+int8 kernels at inference time. It is opt-in: the backend only loads it
+when PATIENT_RISK_QUANT=1, so run the category comparison below first and
+enable it only if the LOW/MODERATE/HIGH distribution shift is acceptable.
+
+Requires optional dependencies: skl2onnx, onnxruntime.
+"""
+
+import os
+
+import joblib
+import pandas as pd
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+ONNX_MODEL = os.path.join(MODEL_DIR, 'model.onnx')
+INT8_MODEL = os.path.join(MODEL_DIR, 'model.int8.onnx')
+
+
+def export_onnx(model_dir=MODEL_DIR):
+    """Convert model.joblib to model.onnx (float32)."""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    model = joblib.load(os.path.join(model_dir, 'model.joblib'))
+    features = joblib.load(os.path.join(model_dir, 'features.joblib'))
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[('input', FloatTensorType([None, len(features)]))],
+        options={id(model): {'zipmap': False}},
+    )
+
+    with open(ONNX_MODEL, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+
+    print(f"Exported ONNX model: {ONNX_MODEL}")
+    return ONNX_MODEL
+
+
+def quantize_int8(onnx_path=ONNX_MODEL, int8_path=INT8_MODEL):
+    """Produce an int8 dynamically-quantized copy of the ONNX model."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Quantized model written: {int8_path}")
+    return int8_path
+
+
+def compare_category_distribution(model_dir=MODEL_DIR, sample_size=2000):
+    """
+    Compare LOW/MODERATE/HIGH banding between the float and int8 models
+    on a held-out sample so ops can judge quantization degradation.
+    """
+    import numpy as np
+    import onnxruntime as ort
+
+    scaler = joblib.load(os.path.join(model_dir, 'scaler.joblib'))
+    features = joblib.load(os.path.join(model_dir, 'features.joblib'))
+
+    triage = pd.read_csv(os.path.join(model_dir, 'Datasets', 'triage.csv'))
+    triage = triage.dropna(subset=[f for f in features if f in triage.columns])
+    triage = triage.head(sample_size)
+
+    df = pd.DataFrame(index=triage.index)
+    for feature in features:
+        if feature in triage.columns:
+            df[feature] = triage[feature]
+        elif feature == 'arrival_ambulance':
+            df[feature] = 0
+        elif feature == 'abnormal_vitals_count':
+            df[feature] = (
+                ((triage['heartrate'] < 50) | (triage['heartrate'] > 110)).astype(int)
+                + ((triage['sbp'] < 90) | (triage['sbp'] > 160)).astype(int)
+                + ((triage['resprate'] < 12) | (triage['resprate'] > 20)).astype(int)
+                + (triage['o2sat'] < 95).astype(int)
+                + ((triage['temperature'] < 36.0) | (triage['temperature'] > 38.0)).astype(int)
+            )
+        else:
+            df[feature] = 0
+
+    scaled = scaler.transform(df[features]).astype(np.float32)
+
+    def band(probabilities):
+        bands = np.full(len(probabilities), 'MODERATE', dtype=object)
+        bands[probabilities < 0.45] = 'LOW'
+        bands[probabilities >= 0.65] = 'HIGH'
+        return bands
+
+    distributions = {}
+    for label, path in (("float", ONNX_MODEL), ("int8", INT8_MODEL)):
+        session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        probs = session.run(None, {'input': scaled})[1][:, 1]
+        values, counts = np.unique(band(probs), return_counts=True)
+        distributions[label] = dict(zip(values, counts.tolist()))
+        print(f"{label}: {distributions[label]}")
+
+    return distributions
+
+
+if __name__ == '__main__':
+    export_onnx()
+    quantize_int8()
+    compare_category_distribution()
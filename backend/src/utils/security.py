@@ -3,19 +3,30 @@ Security utilities for authentication and authorization.
 Implements Requirements 6.4, 6.5 for security measures.
 """
 
+import array
 import hashlib
 import hmac
 import logging
 import os
+import re
 import secrets
+import threading
 import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Callable, Dict, List, Optional, Set
 
 from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.utils.error_handling import (
     ErrorCategory,
     ErrorSeverity,
@@ -26,6 +37,32 @@ from src.utils.validation import validate_api_key_format, sanitize_for_logging,
 logger = logging.getLogger(__name__)
 
 
+if orjson is not None:
+    class ORJSONResponse(Response):
+        """JSONResponse rendered with orjson (C serializer, bytes output)."""
+
+        media_type = "application/json"
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+else:
+    # Without orjson installed the error responses fall back to the
+    # stdlib serializer
+    ORJSONResponse = JSONResponse
+
+
+def _evict_oldest(cache: Dict[str, Any], maxsize: int) -> None:
+    """
+    Drop oldest-inserted entries until ``cache`` has room for one more.
+
+    Dicts iterate in insertion order, so this is FIFO eviction — a cheap
+    stand-in for a bounded cache that keeps attacker-controlled keyspaces
+    (IPs, bogus API keys) from growing memory without limit.
+    """
+    while len(cache) >= maxsize:
+        cache.pop(next(iter(cache)))
+
+
 # API Key storage (in production, use a secure database or secrets manager)
 # This is a simple in-memory implementation for demo purposes
 class APIKeyManager:
@@ -35,19 +72,63 @@ class APIKeyManager:
     Implements Requirement 6.4: Security measures including authentication.
     """
     
+    # Sliding rate-limit window in per-second ring buckets
+    WINDOW_SECONDS = 3600
+
+    # Template used to zero expired bucket ranges with C-level slice
+    # assignment instead of a Python loop over individual buckets
+    _ZERO_BUCKETS = array.array("I", [0]) * WINDOW_SECONDS
+
+    # How long a validate_key result (positive or negative) stays cached,
+    # and how many results (including negative ones for bogus keys spammed
+    # by an attacker) may be cached at once
+    VALIDATION_CACHE_TTL = 60.0
+    VALIDATION_CACHE_MAX = 10_000
+
+    # The per-request mutable maps (usage counters, validation cache) are
+    # sharded by the first digest byte so each dict stays small: inserts
+    # under attack traffic resize a 1/16th-size table instead of one big one
+    N_SHARDS = 16
+
     def __init__(self):
-        self._api_keys: Dict[str, Dict[str, Any]] = {}
-        self._revoked_keys: Set[str] = set()
-        self._key_usage: Dict[str, List[datetime]] = {}
-        
+        # Keys are stored and looked up by SHA-256 digest so the plaintext
+        # secret is never held in memory and every dict probe compares
+        # fixed-length bytes instead of attacker-controlled strings
+        self._api_keys: Dict[bytes, Dict[str, Any]] = {}
+        self._revoked_keys: Set[bytes] = set()
+        # key hash -> [counters ring, last_second, total]; each request does
+        # O(1) bucket work instead of rebuilding a timestamp list
+        self._key_usage: List[Dict[bytes, list]] = [{} for _ in range(self.N_SHARDS)]
+        # key hash -> (expires_at, key_data or None); short-TTL memo of
+        # validate_key so steady traffic skips the format/revoked checks
+        self._validation_cache: List[Dict[bytes, tuple]] = [{} for _ in range(self.N_SHARDS)]
+        self._validation_shard_max = max(1, self.VALIDATION_CACHE_MAX // self.N_SHARDS)
+
         # Initialize with a demo API key (in production, load from secure storage)
         self._initialize_demo_keys()
-    
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _hash_key(api_key: str) -> bytes:
+        """
+        SHA-256 digest used as the storage/lookup key for an API key.
+
+        Memoized: the handful of live keys are re-presented on every
+        authenticated request, so repeat digests become a dict hit. The
+        LRU bound keeps sprayed bogus keys from growing the memo.
+        """
+        return hashlib.sha256(api_key.encode()).digest()
+
+    @classmethod
+    def _shard_index(cls, key_hash: bytes) -> int:
+        """Shard selector: the digest's first byte is already uniform."""
+        return key_hash[0] & (cls.N_SHARDS - 1)
+
     def _initialize_demo_keys(self) -> None:
         """Initialize demo API keys for development/testing."""
         # Demo API key for testing (in production, generate securely)
         demo_key = os.environ.get("DEMO_API_KEY", "demo-api-key-12345678")
-        self._api_keys[demo_key] = {
+        self._api_keys[self._hash_key(demo_key)] = {
             "name": "Demo API Key",
             "created_at": datetime.utcnow(),
             "permissions": ["read", "write"],
@@ -57,7 +138,7 @@ class APIKeyManager:
         
         # Admin API key for system operations
         admin_key = os.environ.get("ADMIN_API_KEY", "admin-api-key-87654321")
-        self._api_keys[admin_key] = {
+        self._api_keys[self._hash_key(admin_key)] = {
             "name": "Admin API Key",
             "created_at": datetime.utcnow(),
             "permissions": ["read", "write", "admin"],
@@ -75,52 +156,95 @@ class APIKeyManager:
         Returns:
             Key metadata if valid, None otherwise
         """
-        if not api_key or not validate_api_key_format(api_key):
+        if not api_key:
             return None
-        
-        if api_key in self._revoked_keys:
-            logger.warning(f"Attempted use of revoked API key: {sanitize_for_logging(api_key[:8])}...")
+
+        now = time.monotonic()
+        key_hash = self._hash_key(api_key)
+        cache_shard = self._validation_cache[self._shard_index(key_hash)]
+        cached = cache_shard.get(key_hash)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        key_data = self._validate_key_uncached(api_key, key_hash)
+        if key_hash not in cache_shard:
+            _evict_oldest(cache_shard, self._validation_shard_max)
+        cache_shard[key_hash] = (now + self.VALIDATION_CACHE_TTL, key_data)
+        return key_data
+
+    def _validate_key_uncached(self, api_key: str, key_hash: bytes) -> Optional[Dict[str, Any]]:
+        """Full format/revocation/active validation (cache miss path)."""
+        if not validate_api_key_format(api_key):
             return None
-        
-        key_data = self._api_keys.get(api_key)
+
+        if key_hash in self._revoked_keys:
+            logger.warning("Attempted use of revoked API key: %s...", sanitize_for_logging(api_key[:8]))
+            return None
+
+        key_data = self._api_keys.get(key_hash)
         if not key_data or not key_data.get("is_active", False):
             return None
-        
+
         return key_data
     
-    def check_rate_limit(self, api_key: str) -> bool:
+    def check_rate_limit(self, api_key: str, now: Optional[float] = None) -> bool:
         """
         Check if API key has exceeded its rate limit.
-        
+
         Args:
             api_key: API key to check
-            
+            now: Wall-clock timestamp to use (defaults to time.time(); pass
+                it in when the caller has already captured the time)
+
         Returns:
             True if within rate limit, False if exceeded
         """
-        key_data = self._api_keys.get(api_key)
+        key_hash = self._hash_key(api_key)
+        key_data = self._api_keys.get(key_hash)
         if not key_data:
             return False
-        
+
         rate_limit = key_data.get("rate_limit", 100)
-        current_time = datetime.utcnow()
-        one_hour_ago = current_time - timedelta(hours=1)
-        
-        # Get usage in the last hour
-        if api_key not in self._key_usage:
-            self._key_usage[api_key] = []
-        
-        # Clean old entries
-        self._key_usage[api_key] = [
-            t for t in self._key_usage[api_key] if t > one_hour_ago
-        ]
-        
+        if now is None:
+            now = time.time()
+        now = int(now)
+
+        usage_shard = self._key_usage[self._shard_index(key_hash)]
+        usage = usage_shard.get(key_hash)
+        if usage is None:
+            counters = array.array("I", [0]) * self.WINDOW_SECONDS
+            usage = usage_shard[key_hash] = [counters, now, 0]
+
+        counters, last_second, total = usage
+        if now != last_second:
+            # Slide the window: zero the buckets that fell out of the hour.
+            # The expired range is contiguous modulo the ring size, so it is
+            # at most two slice assignments (both C-level memset/memcpy)
+            window = self.WINDOW_SECONDS
+            steps = now - last_second
+            if steps >= window:
+                counters[:] = self._ZERO_BUCKETS
+                total = 0
+            else:
+                start = (last_second + 1) % window
+                stop = start + steps
+                if stop <= window:
+                    total -= sum(counters[start:stop])
+                    counters[start:stop] = self._ZERO_BUCKETS[start:stop]
+                else:
+                    total -= sum(counters[start:]) + sum(counters[:stop - window])
+                    counters[start:] = self._ZERO_BUCKETS[start:]
+                    counters[:stop - window] = self._ZERO_BUCKETS[:stop - window]
+            usage[1] = now
+            usage[2] = total
+
         # Check limit
-        if len(self._key_usage[api_key]) >= rate_limit:
+        if total >= rate_limit:
             return False
-        
+
         # Record this request
-        self._key_usage[api_key].append(current_time)
+        counters[now % self.WINDOW_SECONDS] += 1
+        usage[2] = total + 1
         return True
     
     def has_permission(self, api_key: str, permission: str) -> bool:
@@ -134,10 +258,10 @@ class APIKeyManager:
         Returns:
             True if key has permission
         """
-        key_data = self._api_keys.get(api_key)
+        key_data = self._api_keys.get(self._hash_key(api_key))
         if not key_data:
             return False
-        
+
         permissions = key_data.get("permissions", [])
         return permission in permissions
     
@@ -151,16 +275,24 @@ class APIKeyManager:
         Returns:
             True if key was revoked
         """
-        if api_key in self._api_keys:
-            self._revoked_keys.add(api_key)
-            self._api_keys[api_key]["is_active"] = False
-            logger.info(f"API key revoked: {sanitize_for_logging(api_key[:8])}...")
+        key_hash = self._hash_key(api_key)
+        if key_hash in self._api_keys:
+            self._revoked_keys.add(key_hash)
+            self._api_keys[key_hash]["is_active"] = False
+            self._validation_cache[self._shard_index(key_hash)].pop(key_hash, None)
+            logger.info("API key revoked: %s...", sanitize_for_logging(api_key[:8]))
             return True
         return False
 
 
-# Global API key manager instance
-api_key_manager = APIKeyManager()
+@lru_cache(maxsize=1)
+def get_api_key_manager() -> APIKeyManager:
+    """Process-wide APIKeyManager accessor (thread-safe one-time init)."""
+    return APIKeyManager()
+
+
+# Backwards-compatible module-level handle
+api_key_manager = get_api_key_manager()
 
 
 class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
@@ -171,21 +303,28 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
     """
     
     # Paths that don't require authentication
-    PUBLIC_PATHS = {
+    PUBLIC_PATHS = frozenset({
         "/",
         "/health",
         "/docs",
         "/openapi.json",
         "/redoc",
         "/demo/info",
-    }
-    
-    # Paths that require authentication (prefix matching)
+    })
+
+    # Paths that require authentication (prefix matching, compiled so the
+    # per-request check is one C-level regex match)
     PROTECTED_PREFIXES = [
         "/patients",
         "/system",
     ]
-    
+    _PROTECTED_RE = re.compile(r"^(?:/patients|/system)")
+
+    # Caps on per-key session tracking and per-IP failure tracking so an
+    # attacker spraying keys or spoofed IPs cannot grow memory unbounded
+    MAX_TRACKED_SESSIONS = 10_000
+    MAX_TRACKED_IPS = 100_000
+
     def __init__(self, app, require_auth: bool = False, enable_session_tracking: bool = True):
         """
         Initialize enhanced authentication middleware.
@@ -198,46 +337,47 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.require_auth = require_auth
         self.enable_session_tracking = enable_session_tracking
+        self._api_key_manager = get_api_key_manager()
         self.active_sessions: Dict[str, Dict[str, Any]] = {}  # API key -> session info
-        self.failed_attempts: Dict[str, List[datetime]] = {}  # IP -> failed attempt times
+        # IP -> monotonic timestamps of failed attempts, oldest first
+        self.failed_attempts: Dict[str, deque] = defaultdict(deque)
         self.max_failed_attempts = 5
         self.lockout_duration = timedelta(minutes=15)
-    
-    def _is_ip_locked_out(self, client_ip: str) -> bool:
+        self._lockout_seconds = self.lockout_duration.total_seconds()
+
+    def _is_ip_locked_out(self, client_ip: str, now: float) -> bool:
         """Check if IP is locked out due to too many failed attempts."""
-        if client_ip not in self.failed_attempts:
+        attempts = self.failed_attempts.get(client_ip)
+        if not attempts:
             return False
-        
-        current_time = datetime.utcnow()
-        cutoff_time = current_time - self.lockout_duration
-        
-        # Clean old attempts
-        self.failed_attempts[client_ip] = [
-            attempt for attempt in self.failed_attempts[client_ip]
-            if attempt > cutoff_time
-        ]
-        
-        return len(self.failed_attempts[client_ip]) >= self.max_failed_attempts
-    
-    def _record_failed_attempt(self, client_ip: str) -> None:
+
+        # Expired attempts leave from the front in O(1) each; no list rebuild
+        cutoff = now - self._lockout_seconds
+        while attempts and attempts[0] < cutoff:
+            attempts.popleft()
+
+        return len(attempts) >= self.max_failed_attempts
+
+    def _record_failed_attempt(self, client_ip: str, now: float) -> None:
         """Record a failed authentication attempt."""
         if client_ip not in self.failed_attempts:
-            self.failed_attempts[client_ip] = []
-        
-        self.failed_attempts[client_ip].append(datetime.utcnow())
-    
+            _evict_oldest(self.failed_attempts, self.MAX_TRACKED_IPS)
+        self.failed_attempts[client_ip].append(now)
+
     def _validate_session(self, api_key: str, client_ip: str, user_agent: str) -> bool:
         """Validate API key session for consistency."""
         if not self.enable_session_tracking:
             return True
-        
+
         if api_key not in self.active_sessions:
             # Create new session
+            _evict_oldest(self.active_sessions, self.MAX_TRACKED_SESSIONS)
+            session_time = datetime.utcnow()
             self.active_sessions[api_key] = {
                 "client_ip": client_ip,
                 "user_agent": user_agent,
-                "first_seen": datetime.utcnow(),
-                "last_seen": datetime.utcnow(),
+                "first_seen": session_time,
+                "last_seen": session_time,
                 "request_count": 1
             }
             return True
@@ -247,13 +387,13 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
         # Check for session hijacking indicators
         if session["client_ip"] != client_ip:
             logger.warning(
-                f"API key session IP mismatch: {session['client_ip']} -> {client_ip}"
+                "API key session IP mismatch: %s -> %s", session["client_ip"], client_ip
             )
             # Allow IP changes but log them (mobile users, etc.)
         
         if session["user_agent"] != user_agent:
             logger.warning(
-                f"API key session User-Agent mismatch for key: {api_key[:8]}..."
+                "API key session User-Agent mismatch for key: %s...", api_key[:8]
             )
             # Allow User-Agent changes but log them
         
@@ -267,20 +407,26 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
         request_id = getattr(request.state, "request_id", "unknown")
         path = request.url.path
         client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-        
-        # Skip authentication for public paths
+
+        # Skip authentication for public paths (cheapest check first)
         if path in self.PUBLIC_PATHS:
             return await call_next(request)
-        
+
         # Check if path requires authentication
-        requires_auth = any(path.startswith(prefix) for prefix in self.PROTECTED_PREFIXES)
-        
-        if not requires_auth or not self.require_auth:
+        if not self.require_auth or self._PROTECTED_RE.match(path) is None:
             return await call_next(request)
-        
+
+        # Snapshot the hot-path headers once; Starlette's Headers is a
+        # case-insensitive wrapper that rescans its raw list on every .get()
+        headers = request.headers
+        user_agent = headers.get("user-agent", "unknown")
+        auth_header = headers.get("authorization", "")
+
+        # Capture the clock once for all time-based checks in this request
+        now = time.monotonic()
+
         # Check if IP is locked out
-        if self._is_ip_locked_out(client_ip):
+        if self._is_ip_locked_out(client_ip, now):
             global_error_handler.handle_error(
                 exception=Exception("IP locked out due to failed authentication attempts"),
                 category=ErrorCategory.AUTHENTICATION,
@@ -294,7 +440,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="IP temporarily locked due to security policy"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=429,
                 content=create_safe_error_response(
                     error_code="IP_LOCKED_OUT",
@@ -304,20 +450,17 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 )
             )
         
-        # Extract API key from multiple possible locations
-        api_key = None
-        auth_header = request.headers.get("Authorization", "")
-        
-        if auth_header.startswith("Bearer "):
-            api_key = auth_header[7:]  # Remove "Bearer " prefix
-        elif auth_header.startswith("ApiKey "):
-            api_key = auth_header[7:]  # Remove "ApiKey " prefix
+        # Extract API key from multiple possible locations; both accepted
+        # Authorization schemes share a 7-char prefix, so one slice-and-
+        # compare handles them in a single pass
+        if auth_header[:7] in ("Bearer ", "ApiKey "):
+            api_key = auth_header[7:]
         else:
             # Check X-API-Key header
-            api_key = request.headers.get("X-API-Key")
+            api_key = headers.get("x-api-key")
         
         if not api_key:
-            self._record_failed_attempt(client_ip)
+            self._record_failed_attempt(client_ip, now)
             
             global_error_handler.handle_error(
                 exception=Exception("Missing API key"),
@@ -333,7 +476,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="Authentication required"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=401,
                 content=create_safe_error_response(
                     error_code="AUTHENTICATION_REQUIRED",
@@ -345,7 +488,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
         
         # Validate API key format first
         if not validate_api_key_format(api_key):
-            self._record_failed_attempt(client_ip)
+            self._record_failed_attempt(client_ip, now)
             
             global_error_handler.handle_error(
                 exception=Exception("Invalid API key format"),
@@ -360,7 +503,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="Invalid API key format"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=401,
                 content=create_safe_error_response(
                     error_code="INVALID_API_KEY_FORMAT",
@@ -370,9 +513,9 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
             )
         
         # Validate API key
-        key_data = api_key_manager.validate_key(api_key)
+        key_data = self._api_key_manager.validate_key(api_key)
         if not key_data:
-            self._record_failed_attempt(client_ip)
+            self._record_failed_attempt(client_ip, now)
             
             global_error_handler.handle_error(
                 exception=Exception("Invalid API key"),
@@ -388,7 +531,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="Invalid API key"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=401,
                 content=create_safe_error_response(
                     error_code="INVALID_API_KEY",
@@ -412,7 +555,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="Session validation failed"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=401,
                 content=create_safe_error_response(
                     error_code="SESSION_INVALID",
@@ -422,7 +565,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
             )
         
         # Check rate limit for this API key
-        if not api_key_manager.check_rate_limit(api_key):
+        if not self._api_key_manager.check_rate_limit(api_key):
             global_error_handler.handle_error(
                 exception=Exception("API key rate limit exceeded"),
                 category=ErrorCategory.AUTHENTICATION,
@@ -436,7 +579,7 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 user_message="API key rate limit exceeded"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=429,
                 content=create_safe_error_response(
                     error_code="API_KEY_RATE_LIMIT",
@@ -453,6 +596,11 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+# Path segments longer than 10 characters (and not template placeholders)
+# are treated as opaque IDs when normalizing endpoints for rate limiting
+_ENDPOINT_ID_RE = re.compile(r"/(?!\{)[^/]{11,}")
+
+
 class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
     """
     Enhanced rate limiting middleware with per-endpoint and per-IP limits.
@@ -467,71 +615,80 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
         "GET /patients/*": {"max_requests": 200, "window_seconds": 60},
         "default": {"max_requests": 100, "window_seconds": 60},
     }
-    
+
+    # Cap on distinct clients tracked per table so spoofed source IPs
+    # cannot grow the timestamp maps without bound
+    MAX_TRACKED_CLIENTS = 100_000
+
+    # How often the full tables are swept for idle clients; between sweeps
+    # only the requesting client's own window is trimmed
+    SWEEP_INTERVAL_SECONDS = 60.0
+
     def __init__(self, app, global_max_requests: int = 1000, global_window_seconds: int = 60):
         super().__init__(app)
         self.global_max_requests = global_max_requests
         self.global_window_seconds = global_window_seconds
-        self.requests: Dict[str, List[float]] = {}  # IP -> timestamps
-        self.endpoint_requests: Dict[str, Dict[str, List[float]]] = {}  # endpoint -> IP -> timestamps
-    
-    def _get_endpoint_pattern(self, method: str, path: str) -> str:
+        # IP -> timestamps (oldest first); deques so expired entries leave
+        # from the front in O(1) instead of rebuilding a list per request
+        self.requests: Dict[str, deque] = defaultdict(deque)
+        self.endpoint_requests: Dict[str, Dict[str, deque]] = defaultdict(
+            lambda: defaultdict(deque)
+        )  # endpoint -> IP -> timestamps
+        self._next_sweep = time.time() + self.SWEEP_INTERVAL_SECONDS
+        # Endpoint patterns compiled once; matching is a single C-level
+        # regex scan per pattern instead of split/zip string walking
+        self._compiled_patterns = [
+            (re.compile("^" + re.escape(pattern).replace(r"\*", "[^/]+") + "$"), limits)
+            for pattern, limits in self.ENDPOINT_LIMITS.items()
+            if pattern != "default"
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_endpoint_pattern(method: str, path: str) -> str:
         """Get the endpoint pattern for rate limiting."""
-        # Normalize path by replacing IDs with wildcards
-        normalized_path = path
-        parts = path.split("/")
-        for i, part in enumerate(parts):
-            if part and not part.startswith("{") and len(part) > 10:
-                # Likely a patient ID or similar
-                parts[i] = "*"
-        normalized_path = "/".join(parts)
-        
-        return f"{method} {normalized_path}"
-    
+        # Normalize the path by replacing ID-like segments with wildcards,
+        # in one regex substitution instead of a split/rebuild/join pass
+        return f"{method} {_ENDPOINT_ID_RE.sub('/*', path)}"
+
     def _get_limits(self, endpoint_pattern: str) -> Dict[str, int]:
         """Get rate limits for an endpoint pattern."""
-        for pattern, limits in self.ENDPOINT_LIMITS.items():
-            if pattern == "default":
-                continue
-            if self._pattern_matches(pattern, endpoint_pattern):
+        for pattern_re, limits in self._compiled_patterns:
+            if pattern_re.match(endpoint_pattern):
                 return limits
         return self.ENDPOINT_LIMITS["default"]
     
-    def _pattern_matches(self, pattern: str, endpoint: str) -> bool:
-        """Check if endpoint matches a pattern."""
-        pattern_parts = pattern.split()
-        endpoint_parts = endpoint.split()
-        
-        if len(pattern_parts) != len(endpoint_parts):
-            return False
-        
-        # Check method
-        if pattern_parts[0] != endpoint_parts[0]:
-            return False
-        
-        # Check path with wildcard support
-        pattern_path = pattern_parts[1].split("/")
-        endpoint_path = endpoint_parts[1].split("/")
-        
-        if len(pattern_path) != len(endpoint_path):
-            return False
-        
-        for p, e in zip(pattern_path, endpoint_path):
-            if p != "*" and p != e:
-                return False
-        
-        return True
-    
-    def _clean_old_requests(self, requests_dict: Dict[str, List[float]], cutoff_time: float) -> None:
-        """Remove old request timestamps."""
-        keys_to_remove = []
-        for key, timestamps in requests_dict.items():
-            requests_dict[key] = [t for t in timestamps if t > cutoff_time]
-            if not requests_dict[key]:
-                keys_to_remove.append(key)
-        for key in keys_to_remove:
-            del requests_dict[key]
-    
+    @staticmethod
+    def _trim_window(timestamps: deque, cutoff_time: float) -> None:
+        """Drop expired timestamps from the front of one client's window."""
+        while timestamps and timestamps[0] <= cutoff_time:
+            timestamps.popleft()
+
+    def _sweep_idle_clients(self, current_time: float) -> None:
+        """
+        Trim every tracked window and drop clients with no recent requests.
+
+        Runs at most once per SWEEP_INTERVAL_SECONDS; the per-request path
+        only touches the requesting client's own deque.
+        """
+        global_cutoff = current_time - self.global_window_seconds
+        for client_ip in list(self.requests):
+            timestamps = self.requests[client_ip]
+            self._trim_window(timestamps, global_cutoff)
+            if not timestamps:
+                del self.requests[client_ip]
+
+        for endpoint_pattern in list(self.endpoint_requests):
+            table = self.endpoint_requests[endpoint_pattern]
+            cutoff = current_time - self._get_limits(endpoint_pattern)["window_seconds"]
+            for client_ip in list(table):
+                timestamps = table[client_ip]
+                self._trim_window(timestamps, cutoff)
+                if not timestamps:
+                    del table[client_ip]
+            if not table:
+                del self.endpoint_requests[endpoint_pattern]
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         client_ip = request.client.host if request.client else "unknown"
         request_id = getattr(request.state, "request_id", "unknown")
@@ -541,19 +698,21 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
         endpoint_pattern = self._get_endpoint_pattern(request.method, request.url.path)
         limits = self._get_limits(endpoint_pattern)
         
-        # Clean old requests
-        global_cutoff = current_time - self.global_window_seconds
-        endpoint_cutoff = current_time - limits["window_seconds"]
-        
-        self._clean_old_requests(self.requests, global_cutoff)
-        
+        # Periodically reclaim idle clients; the per-request path below only
+        # trims the requesting client's own windows
+        if current_time >= self._next_sweep:
+            self._sweep_idle_clients(current_time)
+            self._next_sweep = current_time + self.SWEEP_INTERVAL_SECONDS
+
         # Check global rate limit
         if client_ip not in self.requests:
-            self.requests[client_ip] = []
-        
-        if len(self.requests[client_ip]) >= self.global_max_requests:
-            logger.warning(f"[{request_id}] Global rate limit exceeded for IP: {client_ip}")
-            return JSONResponse(
+            _evict_oldest(self.requests, self.MAX_TRACKED_CLIENTS)
+        ip_window = self.requests[client_ip]
+        self._trim_window(ip_window, current_time - self.global_window_seconds)
+
+        if len(ip_window) >= self.global_max_requests:
+            logger.warning("[%s] Global rate limit exceeded for IP: %s", request_id, client_ip)
+            return ORJSONResponse(
                 status_code=429,
                 content=create_safe_error_response(
                     error_code="RATE_LIMIT_EXCEEDED",
@@ -564,20 +723,18 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
             )
         
         # Check endpoint-specific rate limit
-        if endpoint_pattern not in self.endpoint_requests:
-            self.endpoint_requests[endpoint_pattern] = {}
-        
-        self._clean_old_requests(self.endpoint_requests[endpoint_pattern], endpoint_cutoff)
-        
-        if client_ip not in self.endpoint_requests[endpoint_pattern]:
-            self.endpoint_requests[endpoint_pattern][client_ip] = []
-        
-        if len(self.endpoint_requests[endpoint_pattern][client_ip]) >= limits["max_requests"]:
+        endpoint_table = self.endpoint_requests[endpoint_pattern]
+        if client_ip not in endpoint_table:
+            _evict_oldest(endpoint_table, self.MAX_TRACKED_CLIENTS)
+        endpoint_window = endpoint_table[client_ip]
+        self._trim_window(endpoint_window, current_time - limits["window_seconds"])
+
+        if len(endpoint_window) >= limits["max_requests"]:
             logger.warning(
-                f"[{request_id}] Endpoint rate limit exceeded for IP: {client_ip} "
-                f"on endpoint: {endpoint_pattern}"
+                "[%s] Endpoint rate limit exceeded for IP: %s on endpoint: %s",
+                request_id, client_ip, endpoint_pattern
             )
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=429,
                 content=create_safe_error_response(
                     error_code="ENDPOINT_RATE_LIMIT",
@@ -588,8 +745,8 @@ class EnhancedRateLimitingMiddleware(BaseHTTPMiddleware):
             )
         
         # Record this request
-        self.requests[client_ip].append(current_time)
-        self.endpoint_requests[endpoint_pattern][client_ip].append(current_time)
+        ip_window.append(current_time)
+        endpoint_window.append(current_time)
         
         return await call_next(request)
 
@@ -626,10 +783,10 @@ class ContentValidationMiddleware(BaseHTTPMiddleware):
                     )
                     
                     logger.warning(
-                        f"[{request_id}] Request too large: {length} bytes "
-                        f"(max: {self.MAX_CONTENT_LENGTH})"
+                        "[%s] Request too large: %s bytes (max: %s)",
+                        request_id, length, self.MAX_CONTENT_LENGTH
                     )
-                    return JSONResponse(
+                    return ORJSONResponse(
                         status_code=413,
                         content=create_safe_error_response(
                             error_code="REQUEST_TOO_LARGE",
@@ -661,9 +818,9 @@ class ContentValidationMiddleware(BaseHTTPMiddleware):
                     )
                     
                     logger.warning(
-                        f"[{request_id}] Invalid content type: {base_type}"
+                        "[%s] Invalid content type: %s", request_id, base_type
                     )
-                    return JSONResponse(
+                    return ORJSONResponse(
                         status_code=415,
                         content=create_safe_error_response(
                             error_code="UNSUPPORTED_MEDIA_TYPE",
@@ -675,6 +832,26 @@ class ContentValidationMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+# Per-second memo of the formatted UTC timestamp; security events during an
+# attack burst arrive far faster than the clock ticks, so most calls reduce
+# to one integer compare instead of a datetime construction + isoformat
+_ts_cache: list = [0, ""]
+
+
+def iso_from_ns(ns: int) -> str:
+    """Format a time.time_ns() reading as an ISO-8601 UTC timestamp."""
+    return datetime.utcfromtimestamp(ns / 1e9).isoformat()
+
+
+def _now_iso() -> str:
+    """ISO-8601 UTC timestamp with one-second resolution, cached per second."""
+    second = int(time.time())
+    if second != _ts_cache[0]:
+        _ts_cache[0] = second
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+    return _ts_cache[1]
+
+
 def generate_api_key() -> str:
     """
     Generate a secure API key.
@@ -685,14 +862,27 @@ def generate_api_key() -> str:
     return secrets.token_urlsafe(32)
 
 
+# Verdicts returned by the generated request prefilter
+_PRECHECK_SKIP = 0
+_PRECHECK_TOO_LARGE = 1
+_PRECHECK_VALIDATE = 2
+
+
 class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
     """
     Comprehensive security middleware that combines all security validations.
     
-    Implements Requirement 6.4: Comprehensive input sanitization to prevent 
+    Implements Requirement 6.4: Comprehensive input sanitization to prevent
     injection attacks and data corruption.
     """
-    
+
+    # Paths exempt from security validation
+    SKIP_PATHS = frozenset({"/health", "/docs", "/openapi.json", "/redoc"})
+
+    # Same request-size cap as ContentValidationMiddleware; checked against
+    # the Content-Length header so oversized bodies are rejected unread
+    MAX_CONTENT_LENGTH = ContentValidationMiddleware.MAX_CONTENT_LENGTH
+
     def __init__(self, app, enable_strict_validation: bool = True):
         """
         Initialize comprehensive security middleware.
@@ -703,9 +893,38 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.enable_strict_validation = enable_strict_validation
-        self.security_events: List[Dict[str, Any]] = []
         self.max_security_events = 1000  # Keep last 1000 events in memory
-    
+        # maxlen deque evicts the oldest event on append in O(1); no
+        # re-slicing of the whole list once the buffer is full
+        self.security_events: deque = deque(maxlen=self.max_security_events)
+        self._precheck = self._build_precheck()
+
+    def _build_precheck(self) -> Callable[[str, str, Optional[str]], int]:
+        """
+        Compile a request prefilter with this instance's constants baked in.
+
+        The skip-path set, body-carrying method set and size cap are fixed
+        after construction, so they are emitted as literals — the peephole
+        optimizer folds the set displays into frozenset constants — and the
+        generated function runs without any attribute lookups on ``self``.
+        """
+        skip_paths = ", ".join(repr(path) for path in sorted(self.SKIP_PATHS))
+        src = (
+            "def _precheck(path, method, content_length):\n"
+            f"    if path in {{{skip_paths}}}:\n"
+            f"        return {_PRECHECK_SKIP}\n"
+            "    if method in {'POST', 'PUT', 'PATCH'} and content_length is not None:\n"
+            "        try:\n"
+            f"            if int(content_length) > {self.MAX_CONTENT_LENGTH:d}:\n"
+            f"                return {_PRECHECK_TOO_LARGE}\n"
+            "        except ValueError:\n"
+            "            pass\n"
+            f"    return {_PRECHECK_VALIDATE}\n"
+        )
+        namespace: Dict[str, Any] = {}
+        exec(compile(src, "<security-precheck>", "exec"), namespace)
+        return namespace["_precheck"]
+
     def _log_security_event(self, event_type: str, request_id: str, details: Dict[str, Any]) -> None:
         """Log security event for monitoring."""
         from src.utils.security_config import log_security_event
@@ -714,51 +933,91 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
         
         # Store in memory for monitoring
         event = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "type": event_type,
             "request_id": request_id,
             "details": details
         }
         
         self.security_events.append(event)
-        
-        # Keep only recent events
-        if len(self.security_events) > self.max_security_events:
-            self.security_events = self.security_events[-self.max_security_events:]
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         request_id = getattr(request.state, "request_id", "unknown")
         client_ip = request.client.host if request.client else "unknown"
         
-        # Skip security validation for health check and docs
-        if request.url.path in ["/health", "/docs", "/openapi.json", "/redoc"]:
+        # Specialized prefilter (constants baked in at construction):
+        # skip exempt paths and reject oversized declared lengths before
+        # buffering anything
+        verdict = self._precheck(
+            request.url.path, request.method, request.headers.get("content-length")
+        )
+        if verdict == _PRECHECK_SKIP:
             return await call_next(request)
-        
+        if verdict == _PRECHECK_TOO_LARGE:
+            return ORJSONResponse(
+                status_code=413,
+                content=create_safe_error_response(
+                    error_code="REQUEST_TOO_LARGE",
+                    user_message="Request body is too large",
+                    error_id=request_id,
+                    details={"max_size": self.MAX_CONTENT_LENGTH}
+                )
+            )
+
         # Perform comprehensive request validation
         try:
             # Read request body if present
-            body = None
+            body_bytes = b""
             if request.method in ["POST", "PUT", "PATCH"]:
-                body_bytes = await request.body()
-                if body_bytes:
-                    body = body_bytes.decode('utf-8', errors='ignore')
+                # Accumulate the stream into a bytearray (amortized O(n)
+                # growth) and abort mid-upload the moment the body exceeds
+                # the cap, so a lying/absent Content-Length can't make us
+                # buffer an oversized payload before rejecting it
+                buf = bytearray()
+                async for chunk in request.stream():
+                    buf.extend(chunk)
+                    if len(buf) > self.MAX_CONTENT_LENGTH:
+                        return ORJSONResponse(
+                            status_code=413,
+                            content=create_safe_error_response(
+                                error_code="REQUEST_TOO_LARGE",
+                                user_message="Request body is too large",
+                                error_id=request_id,
+                                details={"max_size": self.MAX_CONTENT_LENGTH}
+                            )
+                        )
+                body_bytes = bytes(buf)
             
             # Validate entire request
             from src.utils.validation import comprehensive_request_validation
             
+            # Starlette's Headers/QueryParams already provide the Mapping
+            # interface the validator needs; copying them into dicts per
+            # request would be two full allocations for nothing.
+            # The scanning itself stays in validation.py on compiled-regex
+            # and str primitives (C loops under the hood); a Cython/PyO3
+            # extension was considered and rejected — this service deploys
+            # as pure Python (Procfile/requirements.txt, no build step)
             validation_issues = comprehensive_request_validation(
-                headers=dict(request.headers),
-                query_params=dict(request.query_params),
-                body=body,
+                headers=request.headers,
+                query_params=request.query_params,
+                body=body_bytes or None,
                 client_ip=client_ip
             )
             
-            # Check for critical security issues
-            critical_issues = []
-            for category, issues in validation_issues.items():
-                if issues:
-                    critical_issues.extend([f"{category}: {issue}" for issue in issues])
-            
+            # Check for critical security issues. Only a capped sample is
+            # ever logged/reported, so count totals cheaply and format just
+            # the first few instead of materializing every issue string
+            total_issues = sum(len(found) for found in validation_issues.values())
+            critical_issues = list(islice(
+                (
+                    f"{category}: {issue}"
+                    for category, found in validation_issues.items()
+                    for issue in found
+                ),
+                10,
+            ))
+
             if critical_issues and self.enable_strict_validation:
                 # Log security event
                 self._log_security_event(
@@ -768,13 +1027,13 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
                         "client_ip": client_ip,
                         "path": request.url.path,
                         "method": request.method,
-                        "issues": critical_issues[:10],  # Limit to first 10 issues
-                        "total_issues": len(critical_issues)
+                        "issues": critical_issues,  # Capped sample
+                        "total_issues": total_issues
                     }
                 )
                 
                 global_error_handler.handle_error(
-                    exception=ValueError(f"Security validation failed: {len(critical_issues)} issues"),
+                    exception=ValueError(f"Security validation failed: {total_issues} issues"),
                     category=ErrorCategory.VALIDATION,
                     severity=ErrorSeverity.HIGH,
                     context={
@@ -786,27 +1045,35 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
                     user_message="Request failed security validation"
                 )
                 
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=400,
                     content=create_safe_error_response(
                         error_code="SECURITY_VALIDATION_FAILED",
                         user_message="Request failed security validation. Please check your input.",
                         error_id=request_id,
-                        details={"issue_count": len(critical_issues)}
+                        details={"issue_count": total_issues}
                     )
                 )
             
-            # If body was read, recreate the request with the body
-            if body:
-                async def receive():
-                    return {"type": "http.request", "body": body.encode('utf-8')}
-                
-                request._receive = receive
+            # Cache the accumulated bytes on the request exactly as
+            # Request.body() would have, so BaseHTTPMiddleware replays the
+            # buffered body to downstream handlers, and expose it on state
+            # so they can skip re-reading the stream entirely
+            if body_bytes:
+                request._body = body_bytes
+                request.state.raw_body = body_bytes
             
-            # Store validation results in request state for downstream use
+            # Store an O(1) validation summary in request state for
+            # downstream use; keeping the full issue lists alive for the
+            # whole response lifetime pins attacker-sized payloads in memory
             request.state.security_validation = {
-                "issues": validation_issues,
-                "validated_at": datetime.utcnow().isoformat(),
+                "issue_count": total_issues,
+                "issue_categories": tuple(
+                    category for category, found in validation_issues.items() if found
+                ),
+                # Raw clock reading; nothing on the hot path reads this, so
+                # formatting is deferred to iso_from_ns at serialization time
+                "validated_at_ns": time.time_ns(),
                 "strict_mode": self.enable_strict_validation
             }
             
@@ -824,11 +1091,11 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
                 user_message="Error during security validation"
             )
             
-            logger.error(f"[{request_id}] Security middleware error: {e}")
+            logger.error("[%s] Security middleware error: %s", request_id, e)
             
             # Continue processing but log the error
             if self.enable_strict_validation:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=500,
                     content=create_safe_error_response(
                         error_code="SECURITY_VALIDATION_ERROR",
@@ -841,16 +1108,24 @@ class ComprehensiveSecurityMiddleware(BaseHTTPMiddleware):
     
     def get_security_events(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent security events for monitoring."""
-        return self.security_events[-limit:]
+        # islice the tail so only the requested window is copied out of
+        # the ring, not the whole buffer
+        start = max(0, len(self.security_events) - limit)
+        return list(islice(self.security_events, start, None))
 
 
+@lru_cache(maxsize=2048)
 def hash_api_key(api_key: str) -> str:
     """
     Hash an API key for secure storage.
-    
+
+    Memoized so re-hashing the same live key on every request is a
+    cache hit; hashlib.sha256 itself dispatches to OpenSSL's hardware-
+    accelerated implementation on first computation.
+
     Args:
         api_key: API key to hash
-        
+
     Returns:
         Hashed API key
     """
@@ -861,12 +1136,20 @@ def hash_api_key(api_key: str) -> str:
 enhanced_auth_middleware = None
 comprehensive_security_middleware = None
 
+# Guards first-time construction of the middleware singletons so
+# concurrent worker startup cannot build (and leak) duplicate instances
+_middleware_lock = threading.Lock()
+
 
 def get_enhanced_auth_middleware(require_auth: bool = False) -> EnhancedAuthenticationMiddleware:
     """Get or create enhanced authentication middleware instance."""
     global enhanced_auth_middleware
     if enhanced_auth_middleware is None:
-        enhanced_auth_middleware = EnhancedAuthenticationMiddleware(None, require_auth=require_auth)
+        with _middleware_lock:
+            if enhanced_auth_middleware is None:
+                enhanced_auth_middleware = EnhancedAuthenticationMiddleware(
+                    None, require_auth=require_auth
+                )
     return enhanced_auth_middleware
 
 
@@ -874,5 +1157,9 @@ def get_comprehensive_security_middleware(strict_validation: bool = True) -> Com
     """Get or create comprehensive security middleware instance."""
     global comprehensive_security_middleware
     if comprehensive_security_middleware is None:
-        comprehensive_security_middleware = ComprehensiveSecurityMiddleware(None, enable_strict_validation=strict_validation)
+        with _middleware_lock:
+            if comprehensive_security_middleware is None:
+                comprehensive_security_middleware = ComprehensiveSecurityMiddleware(
+                    None, enable_strict_validation=strict_validation
+                )
     return comprehensive_security_middleware
\ No newline at end of file
@@ -3,9 +3,21 @@ Security configuration and utilities for the Patient Risk Classifier Backend.
 Implements Requirements 6.4 and 6.5 for comprehensive security measures.
 """
 
+import logging
 import os
-from typing import Dict, List, Optional
+import queue
+import re
+import sys
+import threading
 from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.validation import sanitize_log_message
 
 
 @dataclass
@@ -60,6 +72,29 @@ class SecurityConfig:
                 "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
             }
 
+        # Compile the wildcard endpoint keys once so per-request lookups
+        # are a regex match per pattern instead of repeated glob parsing
+        self._compiled_limits = [
+            (re.compile("^" + re.escape(key).replace(r"\*", "[^/]+") + "$"), limits)
+            for key, limits in self.endpoint_rate_limits.items()
+            if key != "default"
+        ]
+
+    def get_endpoint_limits(self, endpoint: str) -> Dict[str, int]:
+        """
+        Look up rate limits for a "METHOD /path" endpoint string.
+
+        Args:
+            endpoint: Normalized endpoint, e.g. "GET /patients/123"
+
+        Returns:
+            The matching limit entry, or the default limits
+        """
+        for pattern, limits in self._compiled_limits:
+            if pattern.match(endpoint):
+                return limits
+        return self.endpoint_rate_limits["default"]
+
 
 def get_security_config() -> SecurityConfig:
     """
@@ -217,6 +252,60 @@ SUSPICIOUS_USER_AGENTS = [
 ]
 
 
+# Compiled once at import so per-request validators call bound .search()
+# methods instead of re-parsing pattern source (or racing re's small
+# internal compile cache) on every field
+EXTENDED_DANGEROUS_PATTERNS_RE = tuple(
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in EXTENDED_DANGEROUS_PATTERNS
+)
+
+# Single alternation over every dangerous pattern: one scan of the input
+# decides "is anything suspicious here" instead of ~40 separate regex
+# passes. Use the per-pattern tuple above only when the specific match
+# matters (e.g. for reporting which pattern fired).
+EXTENDED_DANGEROUS_UNION_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in EXTENDED_DANGEROUS_PATTERNS),
+    re.IGNORECASE | re.DOTALL,
+)
+
+SUSPICIOUS_USER_AGENTS_RE = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in SUSPICIOUS_USER_AGENTS
+)
+
+# Most suspicious-UA entries are plain substrings (tool names); split them
+# from the true regexes so a User-Agent is judged with two fused scans —
+# one multi-literal alternation and one regex alternation — instead of
+# ~60 separate regex calls
+_UA_PLAIN_LITERAL_RE = re.compile(r"^[a-z0-9 _.\-]+$", re.IGNORECASE)
+_ua_literals = [p for p in SUSPICIOUS_USER_AGENTS if _UA_PLAIN_LITERAL_RE.fullmatch(p)]
+_ua_regexes = [p for p in SUSPICIOUS_USER_AGENTS if not _UA_PLAIN_LITERAL_RE.fullmatch(p)]
+
+SUSPICIOUS_UA_LITERAL_UNION_RE = re.compile(
+    "|".join(re.escape(literal) for literal in _ua_literals), re.IGNORECASE
+)
+SUSPICIOUS_UA_REGEX_UNION_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in _ua_regexes), re.IGNORECASE
+)
+
+
+def is_suspicious_user_agent(user_agent: str) -> bool:
+    """
+    Check a User-Agent against the suspicious list in two fused scans.
+
+    Args:
+        user_agent: User-Agent header value
+
+    Returns:
+        True if the User-Agent matches any suspicious entry
+    """
+    return bool(
+        SUSPICIOUS_UA_LITERAL_UNION_RE.search(user_agent)
+        or SUSPICIOUS_UA_REGEX_UNION_RE.search(user_agent)
+    )
+
+
 # Medical data validation ranges (Requirement 6.1)
 MEDICAL_VALIDATION_RANGES = {
     "heart_rate": {
@@ -264,36 +353,104 @@ MEDICAL_VALIDATION_RANGES = {
 }
 
 
-def get_allowed_origins() -> List[str]:
+# Column order for batch vitals arrays, with the range table flattened
+# into min/max vectors so a whole batch is validated in one broadcast
+VITALS_FIELD_ORDER = (
+    "heart_rate",
+    "systolic_bp",
+    "diastolic_bp",
+    "respiratory_rate",
+    "oxygen_saturation",
+    "temperature",
+)
+_RANGE_MIN = np.array(
+    [MEDICAL_VALIDATION_RANGES[f]["min"] for f in VITALS_FIELD_ORDER], dtype=np.float32
+)
+_RANGE_MAX = np.array(
+    [MEDICAL_VALIDATION_RANGES[f]["max"] for f in VITALS_FIELD_ORDER], dtype=np.float32
+)
+_CRITICAL_LOW = np.array(
+    [MEDICAL_VALIDATION_RANGES[f]["critical_low"] for f in VITALS_FIELD_ORDER],
+    dtype=np.float32,
+)
+_CRITICAL_HIGH = np.array(
+    [MEDICAL_VALIDATION_RANGES[f]["critical_high"] for f in VITALS_FIELD_ORDER],
+    dtype=np.float32,
+)
+
+
+def validate_vitals_batch(vitals: "np.ndarray") -> "np.ndarray":
+    """
+    Validate a batch of vital-sign rows against the medical ranges.
+
+    Args:
+        vitals: Array of shape (N, 6) with columns in VITALS_FIELD_ORDER
+
+    Returns:
+        Boolean mask of shape (N,), True where every field is in range
+    """
+    arr = np.asarray(vitals, dtype=np.float32)
+    return ((arr >= _RANGE_MIN) & (arr <= _RANGE_MAX)).all(axis=1)
+
+
+def critical_vitals_batch(vitals: "np.ndarray") -> "np.ndarray":
+    """
+    Flag rows with any vital outside its critical band.
+
+    Args:
+        vitals: Array of shape (N, 6) with columns in VITALS_FIELD_ORDER
+
+    Returns:
+        Boolean mask of shape (N,), True where any field is critical
+    """
+    arr = np.asarray(vitals, dtype=np.float32)
+    return ((arr < _CRITICAL_LOW) | (arr > _CRITICAL_HIGH)).any(axis=1)
+
+
+@lru_cache(maxsize=1)
+def get_allowed_origins() -> Tuple[str, ...]:
     """
     Get allowed CORS origins from environment or defaults.
-    
+
+    Computed once per process (the environment does not change at
+    runtime) and returned as an immutable tuple. Tests that mutate
+    ``ALLOWED_ORIGINS`` should call ``get_allowed_origins.cache_clear()``.
+
     Returns:
-        List of allowed origins for CORS
+        Tuple of allowed origins for CORS
     """
     origins_env = os.getenv("ALLOWED_ORIGINS", "*")
     if origins_env == "*":
-        return ["*"]  # Allow all origins (development only)
-    
-    return [origin.strip() for origin in origins_env.split(",")]
+        return ("*",)  # Allow all origins (development only)
+
+    return tuple(origin.strip() for origin in origins_env.split(","))
 
 
+@lru_cache(maxsize=1)
 def is_production_environment() -> bool:
     """
     Check if running in production environment.
-    
+
+    Cached for the process lifetime; tests that change ``ENVIRONMENT``
+    should call ``is_production_environment.cache_clear()``.
+
     Returns:
         True if in production environment
     """
     return os.getenv("ENVIRONMENT", "development").lower() == "production"
 
 
-def get_api_keys_from_env() -> Dict[str, Dict[str, any]]:
+@lru_cache(maxsize=1)
+def get_api_keys_from_env() -> Mapping[str, Dict[str, any]]:
     """
     Load API keys from environment variables.
-    
+
+    Computed once per process (the environment does not change at
+    runtime) and returned as a read-only mapping so callers cannot
+    mutate the shared result.
+
     Returns:
-        Dictionary of API keys and their metadata
+        Read-only mapping of API keys and their metadata
     """
     api_keys = {}
     
@@ -329,70 +486,162 @@ def get_api_keys_from_env() -> Dict[str, Dict[str, any]]:
                     "rate_limit": 5000,
                     "is_active": True,
                 }
-    
-    return api_keys
+
+    return MappingProxyType(api_keys)
+
+
+@lru_cache(maxsize=1)
+def get_api_key_hashes_from_env() -> Mapping[str, Dict[str, any]]:
+    """
+    Environment API keys indexed by SHA-256 hex digest.
+
+    Lets validators resolve a presented key with one hash plus one dict
+    get instead of iterating the plaintext key set.
+
+    Returns:
+        Read-only mapping of key digest to metadata
+    """
+    from src.utils.security import hash_api_key
+
+    return MappingProxyType({
+        hash_api_key(key): metadata
+        for key, metadata in get_api_keys_from_env().items()
+    })
 
 
 # Security event types for logging
-class SecurityEventType:
-    """Security event types for comprehensive logging."""
-    
-    AUTHENTICATION_FAILURE = "auth_failure"
-    RATE_LIMIT_EXCEEDED = "rate_limit_exceeded"
-    SUSPICIOUS_INPUT = "suspicious_input"
-    INJECTION_ATTEMPT = "injection_attempt"
-    PATH_TRAVERSAL = "path_traversal"
-    INVALID_CONTENT_TYPE = "invalid_content_type"
-    REQUEST_TOO_LARGE = "request_too_large"
-    MALFORMED_JSON = "malformed_json"
-    SUSPICIOUS_USER_AGENT = "suspicious_user_agent"
-    INVALID_IP_ADDRESS = "invalid_ip_address"
-    HEADER_VALIDATION_FAILURE = "header_validation_failure"
+class SecurityEventType(IntEnum):
+    """
+    Security event types for comprehensive logging.
+
+    Members are small ints so event-type dict lookups hash integers
+    instead of strings; the log-facing names live in the parallel
+    ``_EVENT_TYPE_NAMES`` tuple (see ``event_type_name``).
+    """
+
+    AUTHENTICATION_FAILURE = 0
+    RATE_LIMIT_EXCEEDED = 1
+    SUSPICIOUS_INPUT = 2
+    INJECTION_ATTEMPT = 3
+    PATH_TRAVERSAL = 4
+    INVALID_CONTENT_TYPE = 5
+    REQUEST_TOO_LARGE = 6
+    MALFORMED_JSON = 7
+    SUSPICIOUS_USER_AGENT = 8
+    INVALID_IP_ADDRESS = 9
+    HEADER_VALIDATION_FAILURE = 10
+
+
+# Interned log names indexed by SecurityEventType value; interning means
+# repeat emissions of the same event type reuse one string object instead
+# of allocating a fresh one per event.
+_EVENT_TYPE_NAMES = tuple(sys.intern(name) for name in (
+    "auth_failure",
+    "rate_limit_exceeded",
+    "suspicious_input",
+    "injection_attempt",
+    "path_traversal",
+    "invalid_content_type",
+    "request_too_large",
+    "malformed_json",
+    "suspicious_user_agent",
+    "invalid_ip_address",
+    "header_validation_failure",
+))
+
+
+def event_type_name(event_type: Union[SecurityEventType, int, str]) -> str:
+    """Log-facing name for an event type (enum member or free-form string)."""
+    if isinstance(event_type, int):
+        return _EVENT_TYPE_NAMES[event_type]
+    return event_type
+
+
+# Security events are queued on the request path and drained by a single
+# daemon thread, so sanitization/formatting and log-handler I/O never run
+# inside a request. The queue is bounded; a burst beyond it drops events
+# and counts the drops instead of blocking the server.
+_SECURITY_EVENT_QUEUE_MAX = 16384
+_security_event_queue: "queue.Queue" = None
+_security_events_dropped = 0
+_drain_thread_lock = threading.Lock()
+
+_SEVERITY_LEVELS = {
+    "critical": logging.CRITICAL,
+    "high": logging.ERROR,
+    "medium": logging.WARNING,
+}
+
+
+def _drain_security_events() -> None:
+    """Drain loop: sanitize, format and emit queued security events."""
+    logger = logging.getLogger("security")
+    while True:
+        event_type, request_id, details, severity = _security_event_queue.get()
+
+        # Sanitize details for safe logging; numeric/bool primitives carry
+        # no injection risk and are copied as-is instead of str-ified
+        safe_details = {}
+        for key, value in details.items():
+            if isinstance(value, str):
+                safe_details[key] = sanitize_log_message(value)
+            elif isinstance(value, (int, float, bool)):
+                safe_details[key] = value
+            else:
+                safe_details[key] = repr(value)[:100]  # Limit non-string values
+
+        log_message = (
+            f"SECURITY_EVENT: {event_type_name(event_type)} | "
+            f"RequestID: {request_id} | "
+            f"Severity: {severity} | "
+            f"Details: {safe_details}"
+        )
+
+        logger.log(_SEVERITY_LEVELS.get(severity, logging.INFO), log_message)
+
+
+def _ensure_drain_thread() -> None:
+    """Start the security-event drain thread on first use."""
+    global _security_event_queue
+    if _security_event_queue is not None:
+        return
+    with _drain_thread_lock:
+        if _security_event_queue is not None:
+            return
+        _security_event_queue = queue.Queue(maxsize=_SECURITY_EVENT_QUEUE_MAX)
+        worker = threading.Thread(
+            target=_drain_security_events, name="security-event-drain", daemon=True
+        )
+        worker.start()
+
+
+def get_dropped_security_event_count() -> int:
+    """Number of security events dropped because the queue was full."""
+    return _security_events_dropped
 
 
 def log_security_event(
-    event_type: str,
+    event_type: Union[SecurityEventType, str],
     request_id: str,
     details: Dict[str, any],
     severity: str = "medium"
 ) -> None:
     """
     Log security events with standardized format.
-    
+
     Implements Requirement 6.5: Log detailed error information for security monitoring.
-    
+
     Args:
-        event_type: Type of security event
+        event_type: Type of security event (a ``SecurityEventType`` member
+            or a free-form string for ad-hoc events)
         request_id: Request identifier for tracing
         details: Event details (will be sanitized)
         severity: Event severity (low, medium, high, critical)
     """
-    import logging
-    from src.utils.validation import sanitize_log_message
-    
-    logger = logging.getLogger("security")
-    
-    # Sanitize details for safe logging
-    safe_details = {}
-    for key, value in details.items():
-        if isinstance(value, str):
-            safe_details[key] = sanitize_log_message(value)
-        else:
-            safe_details[key] = str(value)[:100]  # Limit non-string values
-    
-    log_message = (
-        f"SECURITY_EVENT: {event_type} | "
-        f"RequestID: {request_id} | "
-        f"Severity: {severity} | "
-        f"Details: {safe_details}"
-    )
-    
-    # Log at appropriate level based on severity
-    if severity == "critical":
-        logger.critical(log_message)
-    elif severity == "high":
-        logger.error(log_message)
-    elif severity == "medium":
-        logger.warning(log_message)
-    else:
-        logger.info(log_message)
\ No newline at end of file
+    global _security_events_dropped
+
+    _ensure_drain_thread()
+    try:
+        _security_event_queue.put_nowait((event_type, request_id, dict(details), severity))
+    except queue.Full:
+        _security_events_dropped += 1
\ No newline at end of file
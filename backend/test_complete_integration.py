@@ -50,10 +50,15 @@ def test_api_integration():
         "temperature": 39.0
     }
     
+    # One keep-alive session for the whole flow: every call reuses the
+    # same TCP connection instead of paying a fresh handshake per request
+    session = requests.Session()
+    session.headers["Content-Type"] = "application/json"
+
     try:
         # Test 1: Health check
         logger.info("Testing health check endpoint...")
-        response = requests.get(f"{base_url}/health")
+        response = session.get(f"{base_url}/health")
         if response.status_code == 200:
             health_data = response.json()
             logger.info(f"✅ Health check passed: {health_data['status']}")
@@ -63,11 +68,7 @@ def test_api_integration():
         
         # Test 2: Patient registration with ML risk assessment
         logger.info("Testing patient registration with ML risk assessment...")
-        response = requests.post(
-            f"{base_url}/patients",
-            json=test_patient,
-            headers={"Content-Type": "application/json"}
-        )
+        response = session.post(f"{base_url}/patients", json=test_patient)
         
         if response.status_code == 201:
             patient_data = response.json()
@@ -84,10 +85,9 @@ def test_api_integration():
         
         # Test 3: Vital signs update with ML risk assessment
         logger.info("Testing vital signs update with ML risk assessment...")
-        response = requests.put(
+        response = session.put(
             f"{base_url}/patients/{test_patient['patient_id']}/vitals",
-            json=updated_vitals,
-            headers={"Content-Type": "application/json"}
+            json=updated_vitals
         )
         
         if response.status_code == 200:
@@ -101,7 +101,7 @@ def test_api_integration():
         
         # Test 4: Get updated patient status
         logger.info("Testing patient status retrieval...")
-        response = requests.get(f"{base_url}/patients/{test_patient['patient_id']}")
+        response = session.get(f"{base_url}/patients/{test_patient['patient_id']}")
         
         if response.status_code == 200:
             status_data = response.json()
@@ -118,7 +118,7 @@ def test_api_integration():
         
         # Test 5: Get patient history
         logger.info("Testing patient history retrieval...")
-        response = requests.get(f"{base_url}/patients/{test_patient['patient_id']}/history")
+        response = session.get(f"{base_url}/patients/{test_patient['patient_id']}/history")
         
         if response.status_code == 200:
             history_data = response.json()
@@ -135,7 +135,7 @@ def test_api_integration():
         
         # Test 6: Get high-risk patients
         logger.info("Testing high-risk patients query...")
-        response = requests.get(f"{base_url}/patients/high-risk")
+        response = session.get(f"{base_url}/patients/high-risk")
         
         if response.status_code == 200:
             high_risk_data = response.json()
@@ -10,28 +10,32 @@ def test_timezone_strategy():
     """Test the timezone strategy to see what it generates."""
     print('Testing timezone strategy...')
     
+    # Snapshot "now" once; re-evaluating utcnow() per strategy made the
+    # two strategies subtly different and cost a call each
+    now = datetime.utcnow()
+
     # Test timezone-naive strategy
     strategy_naive = st.datetimes(
         min_value=datetime(2020, 1, 1), 
-        max_value=datetime.utcnow(), 
+        max_value=now, 
         timezones=st.none()
     )
     
     # Test timezone-aware strategy  
     strategy_aware = st.datetimes(
         min_value=datetime(2020, 1, 1), 
-        max_value=datetime.utcnow(), 
+        max_value=now, 
         timezones=st.just(timezone.utc)
     )
     
+    # .example() is expensive (it spins up Hypothesis's engine each
+    # call), so draw all three samples from one list-strategy example
     print("Generating timezone-naive samples:")
-    for i in range(3):
-        sample = strategy_naive.example()
+    for i, sample in enumerate(st.lists(strategy_naive, min_size=3, max_size=3).example()):
         print(f'  Sample {i+1}: {sample}, tzinfo: {sample.tzinfo}')
     
     print("\nGenerating timezone-aware samples:")
-    for i in range(3):
-        sample = strategy_aware.example()
+    for i, sample in enumerate(st.lists(strategy_aware, min_size=3, max_size=3).example()):
         print(f'  Sample {i+1}: {sample}, tzinfo: {sample.tzinfo}')
     
     # Test the comparison that's failing
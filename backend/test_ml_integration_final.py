@@ -22,6 +22,16 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Model health doesn't change during a run; memoize the check so every
+# test function in this script shares one model load and warm-up call
+_model_health_cache = {}
+
+
+def _check_model_health_once(risk_service):
+    if 'result' not in _model_health_cache:
+        _model_health_cache['result'] = risk_service.check_model_health()
+    return _model_health_cache['result']
+
 
 def test_complete_ml_integration():
     """Test the complete ML integration flow."""
@@ -148,7 +158,7 @@ def test_ml_model_health():
             risk_service = RiskAssessmentService(db)
             
             # Check model health
-            health = risk_service.check_model_health()
+            health = _check_model_health_once(risk_service)
             logger.info(f"✅ ML Model Health Check:")
             logger.info(f"  Status: {health['status']}")
             logger.info(f"  Mode: {health.get('mode', 'unknown')}")
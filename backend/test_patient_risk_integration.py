@@ -10,7 +10,7 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
-from src.utils.patient_risk_ml_client import PatientRiskMLClient
+from src.utils.patient_risk_ml_client import get_patient_risk_client
 from src.services.risk_assessment_service import RiskAssessmentService
 from src.utils.database import get_db_session
 from src.models.db_models import Patient, VitalSigns, ArrivalModeEnum
@@ -26,8 +26,10 @@ def test_ml_client():
     logger.info("Testing Patient Risk ML Client...")
     
     try:
-        # Initialize the client
-        client = PatientRiskMLClient()
+        # Use the shared client: RiskAssessmentService resolves the same
+        # instance, so the model loads once per process and the predict
+        # below doubles as its warm-up call
+        client = get_patient_risk_client()
         
         # Test health check
         health = client.health_check()
@@ -12,13 +12,26 @@ from uuid import uuid4
 import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from src.models.db_models import ArrivalModeEnum
+from src.models.db_models import ArrivalModeEnum, Base
 from src.repositories.patient_repository import PatientRepository
 from src.repositories.risk_assessment_repository import RiskAssessmentRepository
 from src.repositories.vital_signs_repository import VitalSignsRepository
 from src.services.patient_service import PatientService
-from src.utils.database import create_test_database, get_test_db
+
+# One shared in-memory database for the whole module: the schema is
+# created once here instead of dropped and recreated (with file I/O and
+# fsyncs) for every test, and unique patient IDs keep examples isolated
+_engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+Base.metadata.create_all(bind=_engine)
+_TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
 
 
 def generate_unique_patient_id() -> str:
@@ -29,11 +42,6 @@ def generate_unique_patient_id() -> str:
 class TestCurrentPatientStatusRetrieval:
     """Property 10: Current Patient Status Retrieval - Validates Requirements 4.1"""
 
-    @pytest.fixture(autouse=True)
-    def setup_test_db(self):
-        """Set up clean test database for each test."""
-        create_test_database()
-
     @given(
         arrival_mode=st.sampled_from(ArrivalModeEnum),
         acuity_level=st.integers(min_value=1, max_value=5),
@@ -74,7 +82,7 @@ class TestCurrentPatientStatusRetrieval:
         # Generate unique patient ID for each test iteration
         patient_id = generate_unique_patient_id()
 
-        db_session = next(get_test_db())
+        db_session = _TestingSessionLocal()
         try:
             patient_repo = PatientRepository(db_session)
             vitals_repo = VitalSignsRepository(db_session)
@@ -149,7 +157,7 @@ class TestCurrentPatientStatusRetrieval:
         # Generate unique patient ID for each test iteration
         patient_id = generate_unique_patient_id()
 
-        db_session = next(get_test_db())
+        db_session = _TestingSessionLocal()
         try:
             patient_repo = PatientRepository(db_session)
             vitals_repo = VitalSignsRepository(db_session)
@@ -239,7 +247,7 @@ class TestCurrentPatientStatusRetrieval:
         # Generate unique patient ID for each test iteration
         patient_id = generate_unique_patient_id()
 
-        db_session = next(get_test_db())
+        db_session = _TestingSessionLocal()
         try:
             patient_repo = PatientRepository(db_session)
             vitals_repo = VitalSignsRepository(db_session)
@@ -0,0 +1,39 @@
+"""
+Unit tests for advanced input sanitization, focused on the fast-path
+gate: payloads the dangerous unions match must never skip sanitization.
+"""
+
+import pytest
+
+from src.utils.validation import (
+    advanced_input_sanitization,
+    validate_patient_id,
+)
+
+
+class TestSanitizationFastPathGate:
+    """Test that the short-string fast path never passes dangerous input."""
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            "eval(alert)",
+            "exec(cmd)",
+            "onclick=alert",
+            "union select",
+            "powershell",
+        ],
+    )
+    def test_pure_word_payloads_are_sanitized(self, payload):
+        """Test that short payloads without dirty punctuation still sanitize."""
+        assert advanced_input_sanitization(payload) != payload
+
+    def test_clean_short_input_returns_original_object(self):
+        """Test that genuinely clean input keeps the fast-path identity."""
+        clean = "ordinary clean words"
+        assert advanced_input_sanitization(clean) is clean
+
+    def test_patient_id_rejects_dangerous_word(self):
+        """Test that a safe-alphabet but dangerous patient ID is rejected."""
+        with pytest.raises(ValueError):
+            validate_patient_id("powershell")